@@ -2,7 +2,7 @@
 Request and response models for the Artist Project Assistant API.
 """
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class ProjectRequest(BaseModel):
     """
@@ -25,8 +25,8 @@ class ProjectRequest(BaseModel):
         description="LLM type to use (gemini, claude, gpt4)"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "project_description": "I want to create a mixed media portrait combining acrylic painting with collage elements",
                 "follow_up_question": None,
@@ -34,6 +34,7 @@ class ProjectRequest(BaseModel):
                 "model_type": "gemini"
             }
         }
+    )
 
 class ProjectResponse(BaseModel):
     """
@@ -42,13 +43,14 @@ class ProjectResponse(BaseModel):
     response: str = Field(..., description="The assistant's response")
     session_id: str = Field(..., description="Session ID for follow-up questions")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "response": "I'll help you with your mixed media portrait project...",
                 "session_id": "abc123def456"
             }
         }
+    )
 
 
 class StreamResponse(BaseModel):
@@ -58,10 +60,11 @@ class StreamResponse(BaseModel):
     content: str = Field(..., description="Content chunk")
     session_id: str = Field(..., description="Session ID for follow-ups")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "content": "I'll help you with your mixed media portrait project...",
                 "session_id": "abc123def456"
             }
-        }
\ No newline at end of file
+        }
+    )
\ No newline at end of file
@@ -1,8 +1,10 @@
 """
 API routes for the Artist Project Assistant.
 """
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from api.models import ProjectRequest, ProjectResponse
 from core.assistant import ArtistProjectAssistant
@@ -11,20 +13,25 @@ from services.llm_service import LLMServiceFactory
 
 router = APIRouter()
 
-async def get_assistant(
-    model_type: str = "gemini"
-) -> ArtistProjectAssistant:
+def get_assistant(request: Request, model_type: str = "gemini") -> ArtistProjectAssistant:
     """
-    Dependency for getting an Artist Project Assistant instance.
+    Build an Artist Project Assistant around the app's shared LLM for a model type.
     
     Args:
+        request: The incoming request, used to reach the app state.
         model_type: The type of model to use.
         
     Returns:
         An ArtistProjectAssistant instance.
     """
-    # Get LLM instance
-    llm = LLMServiceFactory.create_llm(model_type)
+    # LLM clients are created once at startup and reused across requests;
+    # this is the only place they are cached, keyed by the normalized model type
+    model_type = model_type.lower()
+    llms = request.app.state.llms
+    llm = llms.get(model_type)
+    if llm is None:
+        # Raises the appropriate HTTPException for unknown or unconfigured models
+        llm = llms[model_type] = LLMServiceFactory.create_llm(model_type)
     
     # Return assistant (no session tracking)
     return ArtistProjectAssistant(llm=llm)
@@ -50,9 +57,9 @@ async def process_request_background(
 
 @router.post("/process", response_model=ProjectResponse)
 async def process_project(
+    request: Request,
     project_request: ProjectRequest,
-    background_tasks: BackgroundTasks,
-    assistant: ArtistProjectAssistant = Depends(get_assistant)
+    background_tasks: BackgroundTasks
 ):
     """
     Process a project request and return the assistant's response.
@@ -60,6 +67,7 @@ async def process_project(
     - For new projects: provide project_description
     - For follow-ups: provide follow_up_question
     """
+    assistant = get_assistant(request, project_request.model_type or "gemini")
     response = await process_request_background(assistant, project_request)
     
     return ProjectResponse(
@@ -67,27 +75,43 @@ async def process_project(
         session_id=None  # Maintain response model but return None for session
     )
 
-@router.post("/process/stream")
-async def process_project_stream(
-    project_request: ProjectRequest,
-    assistant: ArtistProjectAssistant = Depends(get_assistant)
-):
+@router.post(
+    "/process/stream",
+    # The body is parsed by hand below, so document it explicitly
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": ProjectRequest.model_json_schema()}},
+            "required": True
+        }
+    }
+)
+async def process_project_stream(request: Request):
     """
     Stream the assistant's response for a project request.
     
     Returns:
         StreamingResponse with conversation chunks.
     """
-    async def generate_stream():
-        if project_request.follow_up_question:
-            async for chunk in assistant.stream_followup(project_request.follow_up_question):
-                yield chunk
-        else:
-            async for chunk in assistant.stream_project(project_request.project_description):
-                yield chunk
+    # Validate the raw JSON bytes directly, skipping the intermediate dict
+    try:
+        project_request = ProjectRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Match FastAPI's own body validation errors, which are located under "body"
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+    
+    assistant = get_assistant(request, project_request.model_type or "gemini")
+    
+    if project_request.follow_up_question:
+        stream = assistant.stream_followup(project_request.follow_up_question)
+    else:
+        stream = assistant.stream_project(project_request.project_description)
     
+    # StreamingResponse runs sync iterators on a threadpool, one hop per chunk;
+    # the assistant's streams are native async generators (see tests)
     return StreamingResponse(
-        generate_stream(),
+        stream,
         media_type="text/event-stream"
     )
 
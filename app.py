@@ -1,20 +1,39 @@
 """
 Main entry point for the Artist Project Assistant API.
 """
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import os
-import threading
-from mcp_server import mcp
 
 from config import API_TITLE, API_DESCRIPTION, API_VERSION
 from api.routes import router as api_router
+from services.llm_service import LLMServiceFactory
+from utils.cache import load_embedding_model
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load shared models and create one LLM client per model type for the app's lifetime."""
+    # Load the search cache's embedding model now, so download or load failures
+    # surface at startup instead of inside the first request
+    await asyncio.to_thread(load_embedding_model)
+    
+    app.state.llms = {}
+    for model_type in LLMServiceFactory.SUPPORTED_MODEL_TYPES:
+        try:
+            app.state.llms[model_type] = LLMServiceFactory.create_llm(model_type)
+        except HTTPException:
+            # API key not configured; requests for this model get the error instead
+            pass
+    yield
 
 # Initialize FastAPI
 app = FastAPI(
     title=API_TITLE,
     description=API_DESCRIPTION,
-    version=API_VERSION
+    version=API_VERSION,
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -32,8 +51,20 @@ app.include_router(api_router)
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 10000))
-    # Start the MCP server in a separate thread
-    mcp_thread = threading.Thread(target=mcp.run)
-    mcp_thread.start()
+    # The MCP server isn't started here: the MCP client launches mcp_server.py
+    # as its own stdio subprocess (see browser_mcp.json)
     # Start the FastAPI server
-    uvicorn.run("app:app", host="localhost", port=port, reload=True)
+    if os.environ.get("APP_ENV") == "production":
+        # Conversation history lives in process memory, so only raise
+        # WEB_CONCURRENCY once sessions are sticky or stored externally
+        uvicorn.run(
+            "app:app",
+            host="0.0.0.0",
+            port=port,
+            workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+            loop="uvloop",
+            http="httptools",
+            reload=False
+        )
+    else:
+        uvicorn.run("app:app", host="localhost", port=port, reload=True)
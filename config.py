@@ -26,4 +26,17 @@ DEFAULT_MAX_RETRIES = 5
 
 # MCP configuration
 MCP_CONFIG_FILE = "browser_mcp.json"
-MCP_MAX_STEPS = 5
\ No newline at end of file
+MCP_MAX_STEPS = 5
+MCP_RATE_LIMIT = 5  # agent searches started per MCP_RATE_PERIOD
+MCP_RATE_PERIOD = 1.0  # seconds
+# Send all uncached queries to the agent in a single turn instead of one run per query
+MCP_BATCH_SEARCHES = False
+
+# Search cache configuration
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEARCH_CACHE_MAXSIZE = 1024
+SEARCH_CACHE_TTL = 3600  # seconds
+
+# Conversation history configuration
+HISTORY_MAX_MESSAGES = 40
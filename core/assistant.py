@@ -1,16 +1,110 @@
-import json
 import random
 import asyncio
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, AsyncIterator, Set
 
+import numpy as np
+import orjson
+from aiolimiter import AsyncLimiter
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.runnables import RunnablePassthrough, RunnableLambda
 from langchain_core.language_models import BaseChatModel
+from cachetools import TTLCache
 
-from core.prompts import ARTIST_ASSISTANT_PROMPT, RESEARCH_SUMMARY_TEMPLATE, get_search_queries
+from config import (
+    MCP_BATCH_SEARCHES,
+    MCP_MAX_STEPS,
+    MCP_RATE_LIMIT,
+    MCP_RATE_PERIOD,
+    SEARCH_CACHE_MAXSIZE,
+    SEARCH_CACHE_TTL
+)
+from core.prompts import (
+    ARTIST_ASSISTANT_PROMPT,
+    HISTORY_SUMMARY_PROMPT,
+    build_batch_search_prompt,
+    build_research_prompt,
+    get_search_queries
+)
+from services.llm_service import LLMServiceFactory
 from services.mcp_service import MCPService
-from utils.session import conversation_history
+from utils.cache import SemanticCache, normalize_key
+from utils.session import (
+    add_to_history,
+    conversation_history,
+    history_state,
+    history_summary,
+    rendered_history
+)
+from utils.streaming import batched_stream
+
+# Cap on concurrent MCP agent searches shared by every assistant in the process
+MAX_CONCURRENT_SEARCHES = 5
+_SEARCH_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+# Serializes agent initialization so concurrent queries don't each open MCP sessions
+_AGENT_INIT_LOCK = asyncio.Lock()
+
+# Token bucket pacing how fast agent searches start, shared process-wide
+_MCP_LIMITER = AsyncLimiter(max_rate=MCP_RATE_LIMIT, time_period=MCP_RATE_PERIOD)
+
+# Process-wide search results, shared across the per-request assistants
+_SEARCH_CACHE = SemanticCache(TTLCache(maxsize=SEARCH_CACHE_MAXSIZE, ttl=SEARCH_CACHE_TTL))
+
+# Searches currently running, keyed by query, so concurrent requests for the
+# same query wait on one agent call instead of each firing their own
+_INFLIGHT: Dict[str, asyncio.Task] = {}
+
+# Phrase every fallback search result contains, used to detect failed searches
+_SEARCH_FALLBACK_PHRASE = "couldn't retrieve external information"
+
+# Prefixes of the error strings MCPAgent.run returns instead of raising
+_AGENT_ERROR_PREFIXES = (
+    "Agent stopped due to an error",
+    "Agent stopped due to a parsing error",
+    "Agent stopped after reaching the maximum number of steps"
+)
+
+# Markers the agent emits when a search was rate limited, matched against lowercased text
+_RATE_LIMIT_MARKERS = ("rate-limited", "unable to complete")
+
+# Translation table that deletes markdown emphasis from search results
+_STRIP_ASTERISKS = str.maketrans("", "", "*")
+
+# Follow-ups send the last _MAX_HISTORY_TURNS turns verbatim; older ones are summarized
+_MAX_HISTORY_TURNS = 8
+# Turns that left the window are folded into the summary this many at a time
+_SUMMARY_BATCH_TURNS = 4
+# Running background summary refresh; the history is shared, so at most one at a time
+_SUMMARY_TASKS: Set[asyncio.Task] = set()
+# Fire-and-forget LLM connection warm-ups, referenced here until they finish
+_WARM_UP_TASKS: Set[asyncio.Task] = set()
+
+def _is_rate_limited(text: str) -> bool:
+    """
+    Check whether an agent answer reports that the search was rate limited.
+    
+    Args:
+        text: The agent's answer.
+        
+    Returns:
+        True if the answer contains one of the rate-limit markers.
+    """
+    lowered = text.lower()
+    return any(marker in lowered for marker in _RATE_LIMIT_MARKERS)
+
+async def _iter_content(stream: AsyncIterator[Any]) -> AsyncIterator[str]:
+    """
+    Extract the text from streamed LLM message chunks.
+    
+    Args:
+        stream: The LLM's chunk stream.
+        
+    Yields:
+        The non-empty content of each chunk.
+    """
+    async for chunk in stream:
+        content = getattr(chunk, "content", None)
+        if content:
+            yield content
 
 class ArtistProjectAssistant:
     """Core Assistant class for helping artists with projects with true streaming and improved error handling."""
@@ -23,30 +117,15 @@ class ArtistProjectAssistant:
             llm: The language model to use.
         """
         self.conversation_history = conversation_history
+        self.rendered_history = rendered_history
         self.llm = llm
         
         # Create MCP agent
         self.agent = MCPService.create_agent(self.llm)
-        
-        # Create the chain for both initial project and follow-up questions
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", ARTIST_ASSISTANT_PROMPT),
-            ("user", "{input}"),
-            ("user", "{chat_history}")
-        ])
-        
-        self.chain = (
-            {
-                "input": RunnablePassthrough(),
-                "chat_history": RunnableLambda(lambda x: self._get_context_string())
-            }
-            | self.prompt
-            | self.llm
-        )
 
-        self.search_cache = {}
-        self.max_retries = 3
-        self.retry_delay = 5  # seconds
+        self.max_retries = 5
+        self.retry_base = 0.5  # seconds
+        self.retry_cap = 30  # seconds
     
     def _get_context_string(self):
         """
@@ -55,10 +134,113 @@ class ArtistProjectAssistant:
         Returns:
             String representation of chat history.
         """
-        context = "\n".join([f"{msg['role']}: {msg['message']}" for msg in self.conversation_history]) 
+        context = "\n".join(self.rendered_history)
         # print(f"SEE THE CONTEXT: {context}")
         return context
     
+    def _get_windowed_context(self) -> str:
+        """
+        Build the chat history context for the LLM, keeping only the most recent turns
+        verbatim and replacing older ones with a rolling summary. Older turns not yet
+        folded into the summary stay verbatim. The pinned project description is
+        always included.
+            
+        Returns:
+            String representation of the windowed chat history.
+        """
+        history = list(self.rendered_history)
+        total = history_state["total"]
+        # Absolute positions of the oldest retained message and the first verbatim one
+        first = total - len(history)
+        start = max(first, min(history_summary["covered"], total - _MAX_HISTORY_TURNS * 2))
+        
+        lines = []
+        pinned = history_state["pinned"]
+        if pinned is not None and pinned[0] < start:
+            lines.append(pinned[1])
+        if history_summary["text"]:
+            lines.append(f"Previous conversation summary: {history_summary['text']}")
+        lines.extend(history[start - first:])
+        return "\n".join(lines)
+    
+    def _schedule_summary_refresh(self) -> None:
+        """
+        Fold the turns that left the window into the summary in the background, once
+        at least _SUMMARY_BATCH_TURNS of them have accumulated, so follow-ups never
+        wait on a summary call.
+        """
+        if _SUMMARY_TASKS:
+            return
+        
+        history = list(self.rendered_history)
+        total = history_state["total"]
+        first = total - len(history)
+        window_start = max(first, total - _MAX_HISTORY_TURNS * 2)
+        summarize_from = max(history_summary["covered"], first)
+        if window_start - summarize_from < _SUMMARY_BATCH_TURNS * 2:
+            return
+        
+        task = asyncio.create_task(
+            self._refresh_summary(history[summarize_from - first:window_start - first], window_start)
+        )
+        _SUMMARY_TASKS.add(task)
+        task.add_done_callback(_SUMMARY_TASKS.discard)
+    
+    async def _refresh_summary(self, lines: List[str], covered: int) -> None:
+        """
+        Extend the rolling summary with history entries that left the window.
+        
+        Args:
+            lines: The rendered history entries to fold into the summary.
+            covered: Absolute position just past the last of those entries.
+        """
+        try:
+            text = await self._summarize(history_summary["text"], lines)
+        except Exception:
+            # Keep the previous summary; the entries stay verbatim until the next attempt
+            return
+        history_summary.update(covered=covered, text=text)
+    
+    async def _summarize(self, summary: str, lines: List[str]) -> str:
+        """
+        Extend a conversation summary with more history entries.
+        
+        Args:
+            summary: The existing summary, empty if there is none yet.
+            lines: The rendered history entries to fold into the summary.
+            
+        Returns:
+            The updated summary.
+        """
+        prompt = HISTORY_SUMMARY_PROMPT.format(
+            summary=summary or "None",
+            conversation="\n".join(lines)
+        )
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        return response.content
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Compute a retry delay using capped exponential backoff with full jitter.
+        
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            
+        Returns:
+            Seconds to wait before the next attempt.
+        """
+        return random.uniform(0, min(self.retry_cap, self.retry_base * (2 ** attempt)))
+    
+    async def _ensure_agent_initialized(self) -> None:
+        """
+        Initialize the MCP agent once, before any query runs on it.
+        The agent's own run() would otherwise initialize on every concurrent call,
+        each opening its own sessions on the shared client.
+        """
+        async with _AGENT_INIT_LOCK:
+            if not self.agent._initialized:
+                await self.agent.initialize()
+    
     async def _execute_search_with_retry(self, query: str) -> AsyncGenerator[str, None]:
         """
         Execute a search query with retry logic for handling rate limits.
@@ -68,7 +250,7 @@ class ArtistProjectAssistant:
             query: The search query to execute.
             
         Yields:
-            Chunks of search results as they become available or fallback messages.
+            Status messages, then the search answer or the fallback message as the last chunk.
         """
         for attempt in range(self.max_retries):
             try:
@@ -77,36 +259,28 @@ class ArtistProjectAssistant:
                 # Yield initial status
                 yield f"Starting search for: {query}...\n"
                 
-                # Use agent's streaming capabilities if available
-                if hasattr(self.agent, "stream"):
-                    async for chunk in self.agent.stream(search_prompt):
-                        # Check for rate limit indicators in chunks
-                        if "rate-limited" in chunk.lower() or "unable to complete" in chunk.lower():
-                            yield f"\nSearch encountered rate limits. Retrying in {self.retry_delay * (2 ** attempt)} seconds...\n"
-                            await asyncio.sleep(self.retry_delay * (2 ** attempt) + random.uniform(0, 1))
-                            break
-                        yield chunk
-                    else:
-                        # If we completed the loop without breaking, search was successful
-                        yield "\nSearch completed successfully.\n"
-                        return
-                else:
-                    # Fallback for non-streaming agents
-                    yield "Searching...\n"
-                    result = await self.agent.run(search_prompt)
-                    
-                    # Check if the result indicates a rate limit error
-                    if "rate-limited" in result.lower() or "unable to complete" in result.lower():
-                        yield f"\nSearch encountered rate limits. Retrying in {self.retry_delay * (2 ** attempt)} seconds...\n"
-                        await asyncio.sleep(self.retry_delay * (2 ** attempt) + random.uniform(0, 1))
-                        continue
-                    
-                    yield result
-                    return
-                    
+                await self._ensure_agent_initialized()
+                
+                # MCPAgent has no chunk-streaming API for tool runs, so wait for the full answer
+                yield "Searching...\n"
+                async with _MCP_LIMITER:
+                    # The agent is initialized above; don't let run() re-initialize
+                    # it or close the shared client's sessions on errors
+                    result = await self.agent.run(search_prompt, manage_connector=False)
+                
+                # Check if the result indicates a rate limit error
+                if _is_rate_limited(result):
+                    wait_time = self._backoff_delay(attempt)
+                    yield f"\nSearch encountered rate limits. Retrying in {wait_time:.1f} seconds...\n"
+                    await asyncio.sleep(wait_time)
+                    continue
+                
+                yield result
+                return
+                
             except Exception as e:
                 yield f"\nSearch attempt {attempt+1} failed: {str(e)[:50]}...\n"
-                wait_time = self.retry_delay * (2 ** attempt) + random.uniform(0, 1)
+                wait_time = self._backoff_delay(attempt)
                 yield f"Waiting {wait_time:.1f} seconds before retrying...\n"
                 await asyncio.sleep(wait_time)
         
@@ -115,6 +289,23 @@ class ArtistProjectAssistant:
         yield f"\nAll search attempts failed. Using internal knowledge instead.\n"
         yield fallback
     
+    def _is_cacheable(self, query: str, answer: str) -> bool:
+        """
+        Check whether a search answer is real data that later requests may reuse.
+        
+        Args:
+            query: The search query.
+            answer: The search answer, with markdown asterisks removed.
+            
+        Returns:
+            False for fallback messages, agent errors and rate-limit notices.
+        """
+        return not (
+            _SEARCH_FALLBACK_PHRASE in answer
+            or answer.startswith(_AGENT_ERROR_PREFIXES)
+            or _is_rate_limited(answer)
+        )
+    
     def _generate_fallback_response(self, query: str) -> str:
         """
         Generate a fallback response when search fails.
@@ -125,12 +316,151 @@ class ArtistProjectAssistant:
         Returns:
             A fallback response.
         """
-        return f"I couldn't retrieve external information about '{query}' due to service limitations. " \
+        return f"I {_SEARCH_FALLBACK_PHRASE} about '{query}' due to service limitations. " \
                f"I'll use my internal knowledge to assist with this topic instead."
     
+    async def _run_one_query(
+        self,
+        idx: int,
+        query: str,
+        progress: asyncio.Queue,
+        embedding: Optional[np.ndarray] = None
+    ) -> str:
+        """
+        Run a single search query to completion under the shared concurrency cap
+        and cache its answer if the search succeeded.
+        
+        Args:
+            idx: Position of the query in the search query list.
+            query: The search query to execute.
+            progress: Queue that receives ("chunk", query, text) events as the search streams.
+            embedding: The query's embedding from the cache lookup, reused when caching.
+            
+        Returns:
+            The search answer, or the fallback message, with markdown asterisks removed.
+        """
+        async with _SEARCH_SEMAPHORE:
+            answer = ""
+            async for chunk in self._execute_search_with_retry(query):
+                # Status lines only go to the stream; the last chunk is the answer
+                answer = chunk
+                progress.put_nowait(("chunk", query, chunk))
+        
+        # Clean once so cached and fresh results are identical
+        answer = answer.translate(_STRIP_ASTERISKS)
+        # Don't serve failures to later requests once the service recovers
+        if self._is_cacheable(query, answer):
+            await _SEARCH_CACHE.set(query, answer, namespace=idx, embedding=embedding)
+        return answer
+    
+    def _get_search_task(
+        self,
+        idx: int,
+        query: str,
+        progress: asyncio.Queue,
+        embedding: Optional[np.ndarray] = None
+    ) -> tuple[asyncio.Task, bool]:
+        """
+        Get the running search task for a query, starting one if none is in flight.
+        
+        Args:
+            idx: Position of the query in the search query list.
+            query: The search query to execute.
+            progress: Queue for the search's streamed chunks if a new search is started.
+            embedding: The query's embedding from the cache lookup, if one was computed.
+            
+        Returns:
+            Tuple of (task, started) where task resolves to the full search result and
+            started is False when joining a search another request already started.
+        """
+        key = normalize_key(query)
+        task = _INFLIGHT.get(key)
+        if task is not None:
+            return task, False
+        
+        task = asyncio.create_task(self._run_one_query(idx, query, progress, embedding))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+        return task, True
+    
+    async def _await_search(self, idx: int, query: str, task: asyncio.Task, progress: asyncio.Queue) -> None:
+        """
+        Wait for a shared search task without cancelling it for other waiters,
+        then report its result on the progress queue.
+        
+        Args:
+            idx: Position of the query in the search query list.
+            query: The search query being executed.
+            task: The shared search task.
+            progress: Queue that receives the ("done", idx, query, full_result) event.
+        """
+        try:
+            full_result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            full_result = self._generate_fallback_response(query)
+        except Exception:
+            full_result = self._generate_fallback_response(query)
+        # Always report, so the consumer never waits on a search that died
+        progress.put_nowait(("done", idx, query, full_result))
+    
+    async def _execute_batched_search(
+        self,
+        queries: List[tuple[int, str]],
+        embeddings: Dict[int, np.ndarray]
+    ) -> Dict[int, str]:
+        """
+        Search several queries in a single agent turn and cache the results.
+        
+        Args:
+            queries: (idx, query) pairs to search.
+            embeddings: Query embeddings from the cache lookups, keyed by idx.
+            
+        Returns:
+            Mapping from query idx to its result for every query the agent answered;
+            queries missing from the response are left for the per-query path.
+            Results have markdown asterisks removed.
+        """
+        prompt = build_batch_search_prompt([query for _, query in queries])
+        try:
+            await self._ensure_agent_initialized()
+            async with _MCP_LIMITER:
+                # One tool call per query plus the usual budget for the final answer
+                response = await self.agent.run(
+                    prompt,
+                    max_steps=MCP_MAX_STEPS + len(queries),
+                    manage_connector=False
+                )
+            answers = orjson.loads(response[response.index("{"):response.rindex("}") + 1])
+        except Exception:
+            return {}
+        
+        results = {}
+        for number, (idx, query) in enumerate(queries, 1):
+            answer = answers.get(str(number)) if isinstance(answers, dict) else None
+            if isinstance(answer, str) and answer:
+                answer = answer.translate(_STRIP_ASTERISKS)
+                if not self._is_cacheable(query, answer):
+                    continue
+                await _SEARCH_CACHE.set(query, answer, namespace=idx, embedding=embeddings.get(idx))
+                results[idx] = answer
+        return results
+    
+    def _start_llm_warm_up(self) -> None:
+        """
+        Open the LLM's provider connection in the background while searches run.
+        Nothing waits on it, so a slow or failed warm-up never delays synthesis.
+        """
+        task = asyncio.create_task(LLMServiceFactory.warm_up(self.llm))
+        _WARM_UP_TASKS.add(task)
+        task.add_done_callback(_WARM_UP_TASKS.discard)
+    
     async def _collect_search_results(self, project_description: str) -> AsyncGenerator[tuple[str, List[Dict[str, str]]], None]:
         """
         Collect search results for the given project description with true streaming.
+        Queries run concurrently and their chunks are forwarded as they arrive; with
+        MCP_BATCH_SEARCHES the uncached queries are first tried in one agent turn.
         
         Args:
             project_description: The project description to research.
@@ -141,29 +471,70 @@ class ArtistProjectAssistant:
         """
         search_queries = get_search_queries(project_description)
         search_results = []
+        progress: asyncio.Queue = asyncio.Queue()
+        waiters = []
+        uncached = []
+        # Embeddings computed by the cache lookups, reused when the results are cached
+        embeddings: Dict[int, np.ndarray] = {}
         
-        for idx, query in enumerate(search_queries, 1):
+        for idx, query in enumerate(search_queries):
             yield f"\n[Researching... {query}\n", search_results
             
-            # Check cache first
-            if query in self.search_cache:
+            # Check cache first; idx is the query's SEARCH_QUERY_TEMPLATES index, so
+            # near matches only count against queries built from the same template
+            cached, embedding = await _SEARCH_CACHE.get(query, namespace=idx)
+            if cached is not None:
                 yield f"Using cached search results for: {query}\n", search_results
-                search_results.append({"query": query, "results": self.search_cache[query]})
+                search_results.append({"query": query, "results": cached})
                 continue
-                
-            # Collect all chunks from the search
-            full_result = ""
-            async for chunk in self._execute_search_with_retry(query):
-                full_result += chunk
-                yield chunk, search_results
-                
-            # Store in cache and add to results
-            self.search_cache[query] = full_result
-            search_results.append({"query": query, "results": full_result.replace("*", "")})
             
-            # Add a small delay between searches for rate limiting
-            yield "Pausing briefly before next search...\n", search_results
-            await asyncio.sleep(1)
+            uncached.append((idx, query))
+            if embedding is not None:
+                embeddings[idx] = embedding
+        
+        if uncached:
+            # Searches are about to run; open the synthesis LLM's connection meanwhile
+            self._start_llm_warm_up()
+        
+        if MCP_BATCH_SEARCHES and len(uncached) > 1:
+            yield f"Searching {len(uncached)} topics in a single agent turn...\n", search_results
+            batched = await self._execute_batched_search(uncached, embeddings)
+            for idx, query in uncached:
+                if idx in batched:
+                    search_results.append({"query": query, "results": batched[idx]})
+                    yield f"Search completed for: {query}\n", search_results
+            uncached = [(idx, query) for idx, query in uncached if idx not in batched]
+        
+        for idx, query in uncached:
+            task, started = self._get_search_task(idx, query, progress, embeddings.get(idx))
+            if not started:
+                yield f"Joining a search already in progress for: {query}\n", search_results
+            waiters.append(asyncio.create_task(self._await_search(idx, query, task, progress)))
+        
+        try:
+            pending = len(waiters)
+            # Query whose chunks were forwarded last, to tag interleaved output
+            streaming_query = None
+            while pending:
+                event = await progress.get()
+                if event[0] == "chunk":
+                    _, query, chunk = event
+                    if query != streaming_query:
+                        streaming_query = query
+                        yield f"\n[{query}]\n", search_results
+                    yield chunk, search_results
+                    continue
+                
+                _, idx, query, full_result = event
+                pending -= 1
+                streaming_query = None
+                search_results.append({"query": query, "results": full_result})
+                yield f"Search completed for: {query}\n", search_results
+        finally:
+            # Stop waiting if the consumer stops early; the shared searches still
+            # finish and populate the cache for other requests
+            for waiter in waiters:
+                waiter.cancel()
             
         # Final yield with complete results
         yield f"\nAll research completed. Found information for {len(search_results)} queries.\n", search_results
@@ -180,43 +551,61 @@ class ArtistProjectAssistant:
         """
 
         # Add user message to chat history
-        self.conversation_history.append({"role": "user", "message": f"Project Description: {project_description}"})
+        add_to_history("user", f"Project Description: {project_description}", pin=True)
 
         # Stream search results while collecting them
         final_results = []
-        async for status_or_chunk, current_results in self._collect_search_results(project_description):
-            yield status_or_chunk
-            final_results = current_results
+        
+        async def search_updates() -> AsyncGenerator[str, None]:
+            nonlocal final_results
+            async for status_or_chunk, current_results in self._collect_search_results(project_description):
+                final_results = current_results
+                yield status_or_chunk
+        
+        # Coalesce the many small status and search chunks before they hit the wire
+        async for text in batched_stream(search_updates()):
+            yield text
+
+        # With no search data there is nothing to synthesize; answer from internal knowledge
+        if final_results and all(_SEARCH_FALLBACK_PHRASE in result["results"] for result in final_results):
+            yield "\nAll searches failed. Building the guide from internal knowledge.\n"
+            yield "\n\n[LLM Synthesis] Generating comprehensive project guide...\n\n"
+            response_parts: List[str] = []
+            async for content in self._stream_fallback_project_guide(project_description):
+                response_parts.append(content)
+                yield content
+            add_to_history("assistant", "".join(response_parts))
+            return
 
         # Once searches are complete, prepare for LLM synthesis
         yield "\n\n[LLM Synthesis] Generating comprehensive project guide...\n\n"
 
         # Prepare the research prompt
-        research_prompt = RESEARCH_SUMMARY_TEMPLATE.format(
+        research_prompt = build_research_prompt(
             project_description=project_description,
-            search_results=json.dumps(final_results, indent=2)
+            search_results=orjson.dumps(final_results).decode("utf-8")
         )
 
-        # Create messages for LLM synthesis
+        # Create messages for LLM synthesis, with the history filled in as for follow-ups
         messages = [
-            SystemMessage(content=ARTIST_ASSISTANT_PROMPT),
+            SystemMessage(content=ARTIST_ASSISTANT_PROMPT.format(chat_history=self._get_windowed_context())),
             HumanMessage(content=research_prompt)
         ]
 
         # Stream the LLM synthesis
-        response_content = ""
-        async for chunk in self.llm.astream(messages):
-            if hasattr(chunk, "content") and chunk.content:
-                response_content += chunk.content
-                yield chunk.content
+        response_parts: List[str] = []
+        async for content in batched_stream(_iter_content(self.llm.astream(messages))):
+            response_parts.append(content)
+            yield content
 
         # Add the final response to chat history
-        self.conversation_history.append({"role": "assistant", "message": response_content})
+        add_to_history("assistant", "".join(response_parts))
 
     async def stream_followup(self, user_input: str) -> AsyncGenerator[str, None]:
         """
         Stream the LLM response for a follow-up question with true streaming.
-        Uses the chain for consistency with initial project approach.
+        Builds the messages directly, like stream_project, instead of going through the chain,
+        with the windowed history filled into the system prompt as the chain did.
         
         Args:
             user_input: The follow-up question or request.
@@ -224,23 +613,29 @@ class ArtistProjectAssistant:
         Yields:
             Chunks of the response as they become available.
         """
+        # Generate context from conversation history, before this question is added to it
+        context = self._get_windowed_context()
+        
         # Add user message to chat history
-        self.conversation_history.append({"role": "user", "message": user_input})
+        add_to_history("user", user_input)
 
-        # Generate context from conversation history
-        
         # Debug print using the constructed context, not self.context
-        # print(f"Conversation history before followup: {self._get_context_string()}")
+        # print(f"Conversation history before followup: {context}")
 
-        # Use the chain for streaming the response
-        response_content = ""
-        async for chunk in self.chain.astream({"input": user_input}):
-            if hasattr(chunk, "content") and chunk.content:
-                response_content += chunk.content
-                yield chunk.content
+        messages = [
+            SystemMessage(content=ARTIST_ASSISTANT_PROMPT.format(chat_history=context)),
+            HumanMessage(content=user_input)
+        ]
+
+        # Stream the response
+        response_parts: List[str] = []
+        async for content in batched_stream(_iter_content(self.llm.astream(messages))):
+            response_parts.append(content)
+            yield content
                 
         # Add the assistant's response to conversation history
-        self.conversation_history.append({"role": "assistant", "message": response_content})
+        add_to_history("assistant", "".join(response_parts))
+        self._schedule_summary_refresh()
         
         # Debug print using the conversation_history
         # print(f"Conversation history after followup: {self.conversation_history}")
@@ -258,9 +653,10 @@ class ArtistProjectAssistant:
         Returns:
             A comprehensive project guide based on the research.
         """
-        full_response = ""
+        chunks: List[str] = []
         async for chunk in self.stream_project(project_description):
-            full_response += chunk
+            chunks.append(chunk)
+        full_response = "".join(chunks)
             
         # Extract just the LLM synthesis part
         synthesis_marker = "[LLM Synthesis] Generating comprehensive project guide..."
@@ -292,21 +688,21 @@ class ArtistProjectAssistant:
         Returns:
             The assistant's response to the follow-up.
         """
-        full_response = ""
+        chunks: List[str] = []
         async for chunk in self.stream_followup(user_input):
-            full_response += chunk
+            chunks.append(chunk)
             
-        return full_response
+        return "".join(chunks)
         
-    async def _generate_fallback_project_guide(self, project_description: str) -> str:
+    async def _stream_fallback_project_guide(self, project_description: str) -> AsyncGenerator[str, None]:
         """
-        Generate a project guide using only the LLM's internal knowledge when searches fail.
+        Stream a project guide using only the LLM's internal knowledge when searches fail.
         
         Args:
             project_description: The project description.
             
-        Returns:
-            A project guide based on internal knowledge.
+        Yields:
+            Chunks of the project guide as they become available.
         """
         fallback_prompt = f"""
         Due to external search limitations, I'll help you with your project using my internal knowledge.
@@ -323,12 +719,12 @@ class ArtistProjectAssistant:
         Focus only on reliable information you're confident about, and be clear about any limitations in your advice.
         """
         
-        # Format context like in main.py
-        context = self._get_context_string()
-        
-        # Add fallback prompt to context
-        combined_prompt = f"{context}\n\nuser: {fallback_prompt}"
+        # The history goes in the system prompt only, as for follow-ups
+        context = self._get_windowed_context()
+        messages = [
+            SystemMessage(content=ARTIST_ASSISTANT_PROMPT.format(chat_history=context)),
+            HumanMessage(content=fallback_prompt)
+        ]
         
-        # Use the chain for generating response
-        response = await self.chain.ainvoke({"input": fallback_prompt})
-        return response.content
\ No newline at end of file
+        async for content in batched_stream(_iter_content(self.llm.astream(messages))):
+            yield content
\ No newline at end of file
@@ -33,8 +33,10 @@ Here is the conversation history:
 Be concise but thorough. Artists need practical, actionable advice.
 """
 
-# Research prompt template
-RESEARCH_SUMMARY_TEMPLATE = """
+# Research prompt, built with an f-string so nothing is parsed per call
+def build_research_prompt(project_description: str, search_results: str) -> str:
+    """Build the synthesis prompt from the project description and serialized search results."""
+    return f"""
 Based on the project description: "{project_description}", I've gathered the following information.
 Please analyze this information and create a comprehensive project guide.
 
@@ -52,13 +54,36 @@ Focus on being practical and specific to this exact project. Prioritize trending
 **IMPORTANT: keep every thhing short and answer in short points**
 """
 
+# Prompt for condensing conversation history that has left the follow-up window
+HISTORY_SUMMARY_PROMPT = """Summarize the following conversation between an artist and their project assistant.
+Keep the project details, decisions made, tools recommended and any open questions.
+Answer in a few short points.
+
+Existing summary:
+{summary}
+
+New conversation:
+{conversation}
+"""
+
+# Search query shapes, in order; a query's index here identifies its template
+SEARCH_QUERY_TEMPLATES = (
+    "trending tools for {pd}",
+    "best software for {pd} 2025",
+    "how to set up {pd} workflow",
+    "tips and best practices for {pd}",
+    "free and paid tools comparison for {pd}"
+)
+
 # Default search queries based on project description
 def get_search_queries(project_description: str) -> list[str]:
     """Generate search queries based on the project description."""
-    return [
-        f"trending tools for {project_description}",
-        f"best software for {project_description} 2025",
-        f"how to set up {project_description} workflow",
-        f"tips and best practices for {project_description}",
-        f"free and paid tools comparison for {project_description}"
-    ]
\ No newline at end of file
+    return [template.format(pd=project_description) for template in SEARCH_QUERY_TEMPLATES]
+
+def build_batch_search_prompt(queries: list[str]) -> str:
+    """Build a single agent prompt that searches every query and answers in JSON."""
+    numbered = "\n".join(f"{i}. {query}" for i, query in enumerate(queries, 1))
+    return f"""Search for information about each of these topics and provide a comprehensive summary of the top 3 results for each:
+{numbered}
+
+Respond with only a JSON object mapping each topic number (as a string) to its summary, e.g. {{"1": "...", "2": "..."}}."""
@@ -1,5 +1,6 @@
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
+import asyncio
 import os
 from typing import Dict, Any
 from serpapi import Client
@@ -12,6 +13,9 @@ API_KEY = os.getenv("SERPAPI_API_KEY")
 if not API_KEY:
     raise ValueError("SERPAPI_API_KEY not found in environment variables. Please set it in the .env file.")
 
+# Shared SerpApi client so its HTTP session is reused across searches
+serp_client = Client(api_key=API_KEY)
+
 # Initialize the MCP server
 mcp = FastMCP("SerpApi MCP Server")
 
@@ -33,20 +37,20 @@ async def search(params: Dict[str, Any] = {}) -> str:
     }
 
     try:
-        client = Client(api_key=API_KEY)
-        data = client.search(**params)
+        # The SerpApi client is synchronous; keep the blocking request off the event loop
+        data = await asyncio.to_thread(serp_client.search, **params)
 
         # Process organic search results if available
-        if "organic_results" in data:
-            formatted_results = []
-            for result in data.get("organic_results", []):
-                title = result.get("title", "No title")
-                link = result.get("link", "No link")
-                snippet = result.get("snippet", "No snippet")
-                formatted_results.append(f"Title: {title}\nLink: {link}\nSnippet: {snippet}\n")
-            return "\n".join(formatted_results) if formatted_results else "No organic results found"
-        else:
+        results = data.get("organic_results")
+        if not results:
             return "No organic results found"
+        
+        return "\n".join(
+            f"Title: {result.get('title', 'No title')}\n"
+            f"Link: {result.get('link', 'No link')}\n"
+            f"Snippet: {result.get('snippet', 'No snippet')}\n"
+            for result in results
+        )
 
     # Handle other exceptions (e.g., network issues)
     except Exception as e:
@@ -1,6 +1,8 @@
 """
 LLM service factory for the Artist Project Assistant.
 """
+import asyncio
+
 from fastapi import HTTPException
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
@@ -20,6 +22,8 @@ from config import (
 class LLMServiceFactory:
     """Factory for creating LLM instances."""
     
+    SUPPORTED_MODEL_TYPES = ("openai", "gemini")
+    
     @staticmethod
     def create_llm(model_type: str = "gemini") -> BaseChatModel:
         """
@@ -66,4 +70,26 @@ class LLMServiceFactory:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid model type: {model_type}. Must be 'openai' or 'gemini'"
-            )
\ No newline at end of file
+            )
+    
+    @staticmethod
+    async def warm_up(llm: BaseChatModel) -> None:
+        """
+        Open the LLM's connection to its provider ahead of the first real call.
+        Best effort: on failure the next call simply connects as usual.
+        
+        Args:
+            llm: An LLM instance created by create_llm.
+        """
+        try:
+            if isinstance(llm, ChatOpenAI):
+                # A model lookup opens a pooled connection that the completion call reuses
+                coro = llm.root_async_client.models.retrieve(llm.model_name)
+            elif isinstance(llm, ChatGoogleGenerativeAI):
+                # Builds the async gRPC client on this loop and connects its channel
+                coro = llm.async_client.transport.grpc_channel.channel_ready()
+            else:
+                return
+            await asyncio.wait_for(coro, timeout=DEFAULT_TIMEOUT)
+        except Exception:
+            pass
@@ -1,6 +1,8 @@
 """
 MCP service for the Artist Project Assistant.
 """
+import functools
+
 from mcp_use import MCPAgent, MCPClient
 from langchain_core.language_models import BaseChatModel
 
@@ -10,9 +12,12 @@ class MCPService:
     """Service for interacting with the MCP client and agent."""
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def create_client() -> MCPClient:
         """
-        Create an MCP client.
+        Create the MCP client, reading the config file only on first use.
+        The same client is returned afterwards so its server connections are reused;
+        it is shared by every request, so agents must never close its sessions.
         
         Returns:
             An MCP client instance.
@@ -23,6 +28,8 @@ class MCPService:
     def create_agent(llm: BaseChatModel) -> MCPAgent:
         """
         Create an MCP agent with the given LLM.
+        Memory is disabled because the agent runs several searches concurrently,
+        and a shared history would leak each search's prompt into the others.
         
         Args:
             llm: The LLM to use with the agent.
@@ -31,4 +38,4 @@ class MCPService:
             An MCP agent instance.
         """
         client = MCPService.create_client()
-        return MCPAgent(llm=llm, client=client, max_steps=MCP_MAX_STEPS)
\ No newline at end of file
+        return MCPAgent(llm=llm, client=client, max_steps=MCP_MAX_STEPS, memory_enabled=False)
\ No newline at end of file
@@ -28,7 +28,6 @@ class LLM:
             if chunk_content:
                 print(chunk_content, end="|", flush=True)
                 full_response += chunk_content
-                await asyncio.sleep(2)  # Using asyncio.sleep instead of time.sleep in async context
         
         return full_response
     
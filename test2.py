@@ -5,20 +5,21 @@ import os
 API_URL = "http://localhost:10000/process/stream"
 
 
-def stream_response():
-    with requests.post(API_URL, json=payload, stream=True) as resp:
+def stream_response(payload, api_url=API_URL):
+    with requests.post(api_url, json=payload, stream=True) as resp:
         resp.raise_for_status()
 
 
         print("Streaming response:")
         for chunk in resp.iter_content(chunk_size=None):
-            if "[LLM Synthesis]" in chunk.decode():
+            if not chunk:
+                continue
+            # Match the marker on the raw bytes; decode only for writing
+            if b"[LLM Synthesis]" in chunk:
                 # Clear the console when the LLM Synthesis is done
                 os.system('clear')
-                pass
-            if chunk:
-                sys.stdout.write(chunk.decode())
-                sys.stdout.flush()
+            sys.stdout.write(chunk.decode())
+            sys.stdout.flush()
 
 if __name__ == "__main__":
 
@@ -28,7 +29,7 @@ if __name__ == "__main__":
     #     "follow_up_question": None,
     #     "session_id": None
     # }
-    # stream_response()
+    # stream_response(payload)
 
     payload = {
             "project_description": None,
@@ -43,13 +44,13 @@ if __name__ == "__main__":
             project_description = input("Enter a project description: ")
             payload["project_description"] = project_description
 
-            stream_response()
+            stream_response(payload)
             new_proj = False
         
         # Follow up question
         follow_up_question = input("Enter a follow up question: ")
         payload["follow_up_question"] = follow_up_question
-        stream_response()
+        stream_response(payload)
 
         if input("Do you want to continue? (y/n): ") == "n":
             break
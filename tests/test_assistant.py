@@ -0,0 +1,251 @@
+"""
+Tests for the Artist Project Assistant core.
+"""
+import asyncio
+import inspect
+import zlib
+from unittest import mock
+
+import numpy as np
+from langchain_core.agents import AgentFinish
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import core.assistant as assistant_module
+from core.assistant import ArtistProjectAssistant, _SEARCH_CACHE
+from core.prompts import get_search_queries
+from services.llm_service import LLMServiceFactory
+from services.mcp_service import MCPService
+from utils import session
+
+class RunningAgent:
+    """Stand-in MCP agent whose runs return a fixed sequence of answers."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = []
+        self._initialized = True
+
+    async def run(self, query, **kwargs):
+        self.calls.append((query, kwargs))
+        return self.answers.pop(0)
+
+def make_assistant(answers) -> ArtistProjectAssistant:
+    with mock.patch("core.assistant.MCPService.create_agent", return_value=RunningAgent(answers)):
+        assistant = ArtistProjectAssistant(llm=FakeListChatModel(responses=[""]))
+    assistant.max_retries = 2
+    assistant.retry_base = 0
+    return assistant
+
+async def collect(assistant: ArtistProjectAssistant, query: str) -> str:
+    return "".join([chunk async for chunk in assistant._execute_search_with_retry(query)])
+
+def test_rate_limited_run_is_retried():
+    assistant = make_assistant(["Search is rate-limited, try later.", "Top results: acrylic paints, primers"])
+
+    output = asyncio.run(collect(assistant, "mural paint"))
+
+    assert "Search encountered rate limits" in output
+    assert output.endswith("Top results: acrylic paints, primers")
+    assert len(assistant.agent.calls) == 2
+
+def test_only_the_exact_rate_limit_markers_trigger_a_retry():
+    assistant = make_assistant(["Vendors listed as ratelimited in the results: none"])
+
+    output = asyncio.run(collect(assistant, "mural paint"))
+
+    assert "Search encountered rate limits" not in output
+    assert len(assistant.agent.calls) == 1
+
+def test_run_leaves_shared_client_sessions_alone():
+    assistant = make_assistant(["Top results: acrylic paints, primers"])
+
+    asyncio.run(collect(assistant, "mural paint"))
+
+    _, kwargs = assistant.agent.calls[0]
+    assert kwargs["manage_connector"] is False
+
+def test_search_falls_back_after_every_attempt_is_rate_limited():
+    assistant = make_assistant(["rate-limited"] * 2)
+
+    output = asyncio.run(collect(assistant, "mural paint"))
+
+    assert output.endswith(assistant._generate_fallback_response("mural paint"))
+
+def fake_embedding(text):
+    # Unrelated texts get near-orthogonal vectors, so only exact keys match
+    vector = np.random.default_rng(zlib.crc32(text.encode())).standard_normal(64)
+    return vector / np.linalg.norm(vector)
+
+async def run_and_look_up(assistant: ArtistProjectAssistant, query: str):
+    with mock.patch("utils.cache.embed_text", fake_embedding):
+        answer = await assistant._run_one_query(0, query, asyncio.Queue())
+        cached, _ = await _SEARCH_CACHE.get(query, namespace=0)
+    return answer, cached
+
+def test_successful_search_caches_only_the_answer():
+    assistant = make_assistant(["Top results: acrylic paints, primers"])
+
+    answer, cached = asyncio.run(run_and_look_up(assistant, "mural paint suppliers"))
+
+    assert answer == "Top results: acrylic paints, primers"
+    assert cached == answer
+
+def test_errored_agent_run_is_not_cached():
+    assistant = make_assistant(["Agent stopped due to an error: tool failed"])
+
+    answer, cached = asyncio.run(run_and_look_up(assistant, "fresco plaster recipes"))
+
+    assert answer == "Agent stopped due to an error: tool failed"
+    assert cached is None
+
+class RecordingExecutor:
+    """Stand-in agent executor that records the history each run step sees."""
+
+    def __init__(self):
+        self.max_iterations = None
+        self.histories = []
+
+    async def _atake_next_step(self, inputs, **kwargs):
+        self.histories.append(list(inputs["chat_history"]))
+        # Let the other search run its step before this one finishes
+        await asyncio.sleep(0.01)
+        return AgentFinish(return_values={"output": f"Results for {inputs['input']}"}, log="")
+
+def test_concurrent_searches_keep_separate_histories():
+    with mock.patch.object(MCPService, "create_client", return_value=mock.Mock()):
+        assistant = ArtistProjectAssistant(llm=FakeListChatModel(responses=[""]))
+    executor = RecordingExecutor()
+    assistant.agent._initialized = True
+    assistant.agent._agent_executor = executor
+
+    async def search_both():
+        return await asyncio.gather(collect(assistant, "mural paint"), collect(assistant, "canvas primer"))
+
+    mural, canvas = asyncio.run(search_both())
+
+    assert "mural paint" in mural and "canvas primer" not in mural
+    assert "canvas primer" in canvas and "mural paint" not in canvas
+    assert executor.histories == [[], []]
+    assert assistant.agent.get_conversation_history() == []
+
+def test_followup_fills_chat_history_into_system_prompt():
+    assistant = make_assistant([])
+    assistant.llm = mock.Mock(wraps=FakeListChatModel(responses=["Use acrylics."]))
+    history = ["user: Project Description: paint a mural", "assistant: Start with a primer."]
+
+    async def followup():
+        with mock.patch.object(ArtistProjectAssistant, "_get_windowed_context", return_value="\n".join(history)):
+            return await assistant.process_followup("Which paint?")
+
+    assert asyncio.run(followup()) == "Use acrylics."
+    system, human = assistant.llm.astream.call_args.args[0]
+    assert "{chat_history}" not in system.content
+    assert "\n".join(history) in system.content
+    assert human.content == "Which paint?"
+
+def test_failed_searches_stream_the_fallback_guide_from_direct_messages():
+    assistant = make_assistant(["rate-limited"] * 10)
+    assistant.max_retries = 1
+    assistant.llm = mock.Mock(wraps=FakeListChatModel(responses=["Sketch first. Then paint."]))
+
+    async def stream():
+        with mock.patch("utils.cache.embed_text", fake_embedding):
+            return [chunk async for chunk in assistant.stream_project("a mural of paper cranes")]
+
+    chunks = asyncio.run(stream())
+
+    assert "".join(chunks).endswith("Sketch first. Then paint.")
+    system, human = assistant.llm.astream.call_args.args[0]
+    assert "{chat_history}" not in system.content
+    assert "Project Description: a mural of paper cranes" in human.content
+    assert not human.content.rstrip().endswith("}")
+
+def reset_history():
+    session.conversation_history.clear()
+    session.rendered_history.clear()
+    session.history_state.update(total=0, pinned=None)
+    session.history_summary.update(covered=0, text="")
+
+async def ask_followups(assistant: ArtistProjectAssistant, count: int):
+    for turn in range(count):
+        await assistant.process_followup(f"Question {turn}?")
+        # Let a scheduled summary refresh run, as it would between requests
+        await asyncio.sleep(0)
+    await asyncio.gather(*assistant_module._SUMMARY_TASKS)
+
+def test_history_is_summarized_in_batches_off_the_followup_path():
+    reset_history()
+    assistant = make_assistant([])
+    assistant.llm = FakeListChatModel(responses=["Answer."])
+
+    with mock.patch.object(ArtistProjectAssistant, "_summarize", return_value="Earlier turns.") as summarize:
+        asyncio.run(ask_followups(assistant, 30))
+
+    # One summary per _SUMMARY_BATCH_TURNS turns that left the window, not one per follow-up
+    assert summarize.call_count <= 30 // assistant_module._SUMMARY_BATCH_TURNS
+    assert session.history_summary["text"] == "Earlier turns."
+
+def test_failed_summary_keeps_the_previous_one_and_the_followup_succeeds():
+    reset_history()
+    session.history_summary["text"] = "Earlier turns."
+    assistant = make_assistant([])
+    assistant.llm = FakeListChatModel(responses=["Answer."])
+
+    with mock.patch.object(ArtistProjectAssistant, "_summarize", side_effect=RuntimeError("LLM down")):
+        asyncio.run(ask_followups(assistant, 15))
+
+    assert session.history_summary == {"covered": 0, "text": "Earlier turns."}
+    assert "user: Question 14?" in assistant._get_windowed_context()
+
+def test_cached_searches_skip_the_llm_warm_up():
+    assistant = make_assistant([])
+    queries = get_search_queries("a quilt of old maps")
+
+    async def research():
+        with mock.patch("utils.cache.embed_text", fake_embedding):
+            for idx, query in enumerate(queries):
+                await _SEARCH_CACHE.set(query, f"Cached results for {query}", namespace=idx)
+            return [update async for update in assistant._collect_search_results("a quilt of old maps")]
+
+    with mock.patch.object(LLMServiceFactory, "warm_up") as warm_up:
+        updates = asyncio.run(research())
+
+    warm_up.assert_not_called()
+    assert len(updates[-1][1]) == len(queries)
+
+def test_synthesis_does_not_wait_for_a_stalled_warm_up():
+    assistant = make_assistant(["Top results: linen, gesso"] * 5)
+    assistant.llm = FakeListChatModel(responses=["Prime the linen."])
+
+    async def stall(llm):
+        await asyncio.Event().wait()
+
+    async def stream():
+        with mock.patch("utils.cache.embed_text", fake_embedding):
+            return [chunk async for chunk in assistant.stream_project("an embroidered linen banner")]
+
+    with mock.patch.object(LLMServiceFactory, "warm_up", side_effect=stall) as warm_up:
+        chunks = asyncio.run(asyncio.wait_for(stream(), timeout=5))
+
+    warm_up.assert_called_once()
+    assert "".join(chunks).endswith("Prime the linen.")
+
+def test_streams_are_native_async_generators():
+    # StreamingResponse would otherwise iterate them on a threadpool, one hop per chunk
+    assert inspect.isasyncgenfunction(ArtistProjectAssistant.stream_project)
+    assert inspect.isasyncgenfunction(ArtistProjectAssistant.stream_followup)
+
+def test_project_synthesis_fills_chat_history_into_system_prompt():
+    reset_history()
+    assistant = make_assistant(["Top results: clay, kilns"] * 5)
+    assistant.llm = mock.Mock(wraps=FakeListChatModel(responses=["Fire at cone 6."]))
+
+    async def stream():
+        with mock.patch("utils.cache.embed_text", fake_embedding):
+            return [chunk async for chunk in assistant.stream_project("a set of stoneware mugs")]
+
+    asyncio.run(stream())
+
+    system, _ = assistant.llm.astream.call_args.args[0]
+    assert "{chat_history}" not in system.content
+    assert "user: Project Description: a set of stoneware mugs" in system.content
@@ -0,0 +1,165 @@
+"""
+Caching utilities for the Artist Project Assistant.
+"""
+import asyncio
+from typing import Any, Dict, Hashable, List, MutableMapping, Optional, Set, Tuple
+
+import numpy as np
+from cachetools import LRUCache
+from fastembed import TextEmbedding
+
+from config import SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD
+
+# Embedding model shared by every semantic cache, loaded at app startup
+_embedding_model: Optional[TextEmbedding] = None
+
+def load_embedding_model() -> TextEmbedding:
+    """
+    Get the shared embedding model, downloading and loading it if needed.
+    Blocking; call it at startup so requests never pay for the load.
+    
+    Returns:
+        The text embedding model.
+    """
+    global _embedding_model
+    if _embedding_model is None:
+        _embedding_model = TextEmbedding(model_name=SEMANTIC_CACHE_MODEL)
+    return _embedding_model
+
+def embed_text(text: str) -> np.ndarray:
+    """
+    Embed a piece of text as a unit-length vector.
+    Runs the model synchronously, so call it off the event loop.
+    
+    Args:
+        text: The text to embed.
+        
+    Returns:
+        The normalized embedding.
+    """
+    vector = next(iter(load_embedding_model().embed([text])))
+    return vector / np.linalg.norm(vector)
+
+def normalize_key(key: str) -> str:
+    """
+    Normalize a cache key so trivially different spellings share an entry.
+    
+    Args:
+        key: The raw key.
+        
+    Returns:
+        The key lowercased with whitespace collapsed.
+    """
+    return " ".join(key.lower().split())
+
+class SemanticCache:
+    """Cache that also returns entries for semantically similar keys, not just exact matches."""
+    
+    DEFAULT_MAXSIZE = 128
+    
+    def __init__(
+        self,
+        store: Optional[MutableMapping[str, Any]] = None,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD
+    ):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            store: Mapping that holds the cached values; defaults to an LRU cache of
+                DEFAULT_MAXSIZE entries. Keys it evicts are dropped from the similarity
+                index as well, so the index is bounded by the store.
+            threshold: Minimum cosine similarity for a near match to count as a hit.
+        """
+        self.threshold = threshold
+        self._values: MutableMapping[str, Any] = LRUCache(self.DEFAULT_MAXSIZE) if store is None else store
+        # Per-namespace aligned lists of keys and their embeddings
+        self._keys: Dict[Hashable, List[str]] = {}
+        self._indexed: Set[Tuple[Hashable, str]] = set()
+        self._embeddings: Dict[Hashable, List[np.ndarray]] = {}
+        # Stacked embedding matrix per namespace, rebuilt lazily after inserts
+        self._matrices: Dict[Hashable, np.ndarray] = {}
+    
+    async def get(self, key: str, namespace: Hashable = None) -> Tuple[Optional[Any], Optional[np.ndarray]]:
+        """
+        Look up a key, falling back to the nearest cached key in the same namespace.
+        
+        Args:
+            key: The key to look up.
+            namespace: Only keys stored under this namespace are considered for near matches.
+            
+        Returns:
+            Tuple of (value, embedding) where value is None on a miss and embedding is
+            the key's embedding when one was computed, to be passed on to set().
+        """
+        key = normalize_key(key)
+        value = self._values.get(key)
+        if value is not None:
+            return value, None
+        
+        # Embed on a worker thread; the vector is also what set() indexes on a miss
+        embedding = await asyncio.to_thread(embed_text, key)
+        keys = self._keys.get(namespace)
+        if not keys:
+            return None, embedding
+        
+        matrix = self._matrices.get(namespace)
+        if matrix is None:
+            matrix = self._matrices[namespace] = np.vstack(self._embeddings[namespace])
+        
+        scores = matrix @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None, embedding
+        
+        value = self._values.get(keys[best])
+        if value is None:
+            # Nearest key was evicted from the store
+            self._prune()
+        return value, embedding
+    
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        namespace: Hashable = None,
+        embedding: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Store a value under a key.
+        
+        Args:
+            key: The key to store.
+            value: The value to cache.
+            namespace: Namespace the key is matched within.
+            embedding: The key's embedding as returned by get(); computed if omitted.
+        """
+        key = normalize_key(key)
+        # Keys that expired from the store keep their index entry until pruned
+        if (namespace, key) not in self._indexed:
+            if embedding is None:
+                embedding = await asyncio.to_thread(embed_text, key)
+            # Another set() may have indexed the key while this one was embedding
+            if (namespace, key) not in self._indexed:
+                self._indexed.add((namespace, key))
+                self._keys.setdefault(namespace, []).append(key)
+                self._embeddings.setdefault(namespace, []).append(embedding)
+                self._matrices.pop(namespace, None)
+        self._values[key] = value
+        
+        if sum(len(keys) for keys in self._keys.values()) > len(self._values):
+            self._prune()
+    
+    def _prune(self) -> None:
+        """Drop index entries whose keys are no longer in the store."""
+        for namespace, keys in self._keys.items():
+            live = [i for i, key in enumerate(keys) if key in self._values]
+            if len(live) != len(keys):
+                self._indexed.difference_update((namespace, key) for key in keys if key not in self._values)
+                self._keys[namespace] = [keys[i] for i in live]
+                self._embeddings[namespace] = [self._embeddings[namespace][i] for i in live]
+                self._matrices.pop(namespace, None)
+        
+        for namespace in [ns for ns, keys in self._keys.items() if not keys]:
+            del self._keys[namespace]
+            del self._embeddings[namespace]
@@ -2,12 +2,40 @@
 Session management for the Artist Project Assistant.
 """
 import uuid
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Dict, List
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, BaseMessage
 
+from config import HISTORY_MAX_MESSAGES
+
 # Global session storage
 sessions: Dict[str, List[BaseMessage]] = {}
-conversation_history = []
+# Bounded conversation history; older messages survive only through history_summary
+conversation_history: Deque[Dict[str, str]] = deque(maxlen=HISTORY_MAX_MESSAGES)
+# "role: message" line for each conversation_history entry, kept in step by add_to_history
+rendered_history: Deque[str] = deque(maxlen=HISTORY_MAX_MESSAGES)
+# Number of messages ever added, and the (position, line) of the latest pinned message,
+# which stays in the context after it leaves the bounded history
+history_state = {"total": 0, "pinned": None}
+# Rolling summary of every message before absolute position "covered"
+history_summary = {"covered": 0, "text": ""}
+
+def add_to_history(role: str, message: str, pin: bool = False) -> None:
+    """
+    Add a message to the conversation history along with its rendered line.
+    
+    Args:
+        role: Who sent the message ("user" or "assistant").
+        message: The message text.
+        pin: Keep this message in the context even after it leaves the history,
+            e.g. the project description.
+    """
+    line = f"{role}: {message}"
+    conversation_history.append({"role": role, "message": message})
+    rendered_history.append(line)
+    if pin:
+        history_state["pinned"] = (history_state["total"], line)
+    history_state["total"] += 1
 
 def create_session(system_prompt: str) -> str:
     """
@@ -0,0 +1,76 @@
+"""
+Streaming helpers for the Artist Project Assistant.
+"""
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, List, Optional
+
+async def batched_stream(
+    source: AsyncIterator[str],
+    max_chars: int = 4096,
+    max_delay: float = 0.05,
+    warmup_flushes: int = 3,
+    warmup_chars: int = 512,
+    warmup_delay: float = 0.02
+) -> AsyncGenerator[str, None]:
+    """
+    Coalesce small streamed chunks into larger ones, flushing when the buffer reaches
+    a size threshold or its oldest chunk has waited long enough, whichever comes first.
+    The first few flushes use lower thresholds so time-to-first-byte stays low.
+    
+    Args:
+        source: The stream of chunks to coalesce.
+        max_chars: Flush once this many characters are buffered.
+        max_delay: Flush once the oldest buffered chunk has waited this many seconds.
+        warmup_flushes: Number of initial flushes that use the warmup thresholds.
+        warmup_chars: Size threshold for the warmup flushes.
+        warmup_delay: Delay threshold for the warmup flushes.
+    
+    Yields:
+        Joined chunks.
+    """
+    loop = asyncio.get_running_loop()
+    buffer: List[str] = []
+    size = 0
+    flushes = 0
+    deadline = 0.0
+    next_chunk: Optional[asyncio.Future] = None
+    
+    try:
+        while True:
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(source.__anext__())
+            
+            # Wait for the next chunk, but only as long as the buffered data may wait
+            timeout = max(0.0, deadline - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({next_chunk}, timeout=timeout)
+            if not done:
+                yield "".join(buffer)
+                buffer, size, flushes = [], 0, flushes + 1
+                continue
+            
+            future, next_chunk = next_chunk, None
+            try:
+                chunk = future.result()
+            except StopAsyncIteration:
+                break
+            
+            warming_up = flushes < warmup_flushes
+            if not buffer:
+                deadline = loop.time() + (warmup_delay if warming_up else max_delay)
+            buffer.append(chunk)
+            size += len(chunk)
+            
+            if size >= (warmup_chars if warming_up else max_chars):
+                yield "".join(buffer)
+                buffer, size, flushes = [], 0, flushes + 1
+        
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        # The consumer stopped early; stop the pending read and close the source
+        if next_chunk is not None:
+            next_chunk.cancel()
+            await asyncio.wait({next_chunk})
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()